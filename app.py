@@ -1,8 +1,12 @@
 import streamlit as st
 import pandas as pd
-import yfinance as yf
 import requests
 import os
+import re
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from cache import FileCache, make_key, ttl_for
 
 # -------------------------
 # How to Use This Web App
@@ -22,19 +26,59 @@ st.markdown("""
 # -------------------------
 # Inputs
 # -------------------------
-ticker = st.text_input("Ticker Symbol", "AAPL")
+TICKER_RE = re.compile(r"[A-Z0-9.\-^=]+")
+
+ticker = st.text_input("Ticker Symbol", "AAPL").strip().upper()
 period = st.selectbox("Period", ["1mo", "3mo", "6mo", "1y", "2y", "5y"], index=2)
 interval = st.selectbox("Interval", ["1d", "1wk", "1mo"], index=0)
 
 # -------------------------
 # Fetch Data Function
 # -------------------------
-def fetch_data(ticker, period, interval):
-    # 1. Try Yahoo Finance
-    try:
+PRICE_COLUMNS = ("Open", "High", "Low", "Close")
+
+file_cache = FileCache()
+
+# Shared keep-alive session for Finnhub, built once per process
+# (module-level objects are recreated on every Streamlit rerun)
+@st.cache_resource
+def finnhub_session():
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        # Retry connect failures only so a stalled Finnhub can't hold up the fallback
+        max_retries=Retry(total=1, connect=1, read=0, status=0, backoff_factor=0.2),
+    ))
+    return session
+
+def select_columns(df, columns):
+    # Newer yfinance returns (Price, Ticker) columns even for one symbol
+    if isinstance(df.columns, pd.MultiIndex):
+        df.columns = df.columns.get_level_values(0)
+    return df[list(columns)].astype("float32")
+
+@st.cache_data(ttl=900, show_spinner=False)
+def download_history(ticker, period, interval, columns=PRICE_COLUMNS):
+    # In-memory L1 (st.cache_data) on top of the on-disk L2 (FileCache)
+    key = make_key(ticker, period, interval, ",".join(columns))
+    data = file_cache.get(key, ttl_for(interval))
+    if data is None:
+        # Imported lazily: yfinance is heavy and the page renders without it
+        import yfinance as yf
+
         data = yf.download(ticker, period=period, interval=interval, progress=False)
-        if not data.empty:
-            return data, "Yahoo Finance"
+        if data.empty:
+            # Raise so empty results are never cached
+            raise ValueError(f"No Yahoo Finance data for {ticker}")
+        data = select_columns(data, columns)
+        file_cache.set(key, data)
+    return data
+
+def fetch_data(ticker, period, interval, columns=PRICE_COLUMNS):
+    # 1. Try Yahoo Finance (cached)
+    try:
+        return download_history(ticker, period, interval, columns), "Yahoo Finance"
     except Exception:
         pass
 
@@ -43,7 +87,7 @@ def fetch_data(ticker, period, interval):
         api_key = st.secrets.get("FINNHUB_API_KEY", None)
         if api_key:
             url = f"https://finnhub.io/api/v1/stock/candle?symbol={ticker}&resolution=D&from=1609459200&to=1672444800&token={api_key}"
-            r = requests.get(url)
+            r = finnhub_session().get(url, timeout=(3.05, 5))
             if r.status_code == 200:
                 js = r.json()
                 if "c" in js and js["c"]:
@@ -53,7 +97,7 @@ def fetch_data(ticker, period, interval):
                         "High": js["h"],
                         "Low": js["l"]
                     })
-                    return df, "Finnhub API"
+                    return select_columns(df, columns), "Finnhub API"
     except Exception:
         pass
 
@@ -61,7 +105,7 @@ def fetch_data(ticker, period, interval):
     try:
         sample_path = os.path.join(os.path.dirname(__file__), "sample_data.csv")
         df = pd.read_csv(sample_path, parse_dates=["Date"], index_col="Date")
-        return df, "Sample CSV"
+        return select_columns(df, columns), "Sample CSV"
     except Exception:
         pass
 
@@ -71,6 +115,10 @@ def fetch_data(ticker, period, interval):
 # Main
 # -------------------------
 if st.button("Get Data"):
+    if not TICKER_RE.fullmatch(ticker):
+        st.warning(f"`{ticker}` is not a valid ticker symbol.")
+        st.stop()
+
     df, source = fetch_data(ticker, period, interval)
 
     if df is not None:
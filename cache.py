@@ -0,0 +1,51 @@
+import hashlib
+import os
+import time
+
+import pandas as pd
+
+CACHE_DIR = os.path.join(os.path.dirname(__file__), ".cache")
+
+# -------------------------
+# TTLs (seconds)
+# -------------------------
+INTRADAY_TTL = 3600
+DAILY_TTL = 86400
+
+
+def make_key(*parts):
+    return hashlib.md5("|".join(str(p) for p in parts).encode()).hexdigest()
+
+
+def ttl_for(interval):
+    # Intraday intervals look like "5m", "60m", "1h"
+    return INTRADAY_TTL if interval.endswith(("m", "h")) else DAILY_TTL
+
+
+class FileCache:
+    """Disk-backed DataFrame cache that survives process restarts."""
+
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.parquet")
+
+    def get(self, key, ttl):
+        path = self._path(key)
+        try:
+            if time.time() - os.path.getmtime(path) > ttl:
+                return None
+            return pd.read_parquet(path)
+        except Exception:
+            return None
+
+    def set(self, key, df):
+        path = self._path(key)
+        tmp_path = f"{path}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            df.to_parquet(tmp_path, compression="snappy")
+            os.replace(tmp_path, path)
+        except Exception:
+            pass